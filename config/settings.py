@@ -16,4 +16,19 @@ SERPER_API_KEY = os.getenv("SERPER_API_KEY")
 DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "gpt-4o-mini")
 
 # Database settings
-SQLITE_DB_FILE = os.getenv("SQLITE_DB_FILE", "sidekick_memory.sqlite")
\ No newline at end of file
+SQLITE_DB_FILE = os.getenv("SQLITE_DB_FILE", "sidekick_memory.sqlite")
+
+# Transcript settings
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+TRANSCRIPT_CACHE_THREADS = int(os.getenv("TRANSCRIPT_CACHE_THREADS", "64"))
+
+# Planner settings
+ENABLE_PLANNER = os.getenv("ENABLE_PLANNER", "false").lower() == "true"
+MAX_SUBTASKS = int(os.getenv("MAX_SUBTASKS", "5"))
+MAX_PARALLEL_WORKERS = int(os.getenv("MAX_PARALLEL_WORKERS", "4"))
+
+# Session supervisor settings
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))  # seconds
+RSS_WATERMARK_MB = float(os.getenv("RSS_WATERMARK_MB", "2048"))
+RSS_LOW_WATERMARK_MB = float(os.getenv("RSS_LOW_WATERMARK_MB", "1536"))
+REAPER_INTERVAL = float(os.getenv("REAPER_INTERVAL", "60"))  # seconds
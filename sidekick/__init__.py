@@ -1,3 +1,3 @@
-from sidekick.core import Sidekick, Evaluator, State, EvaluatorOutput
+from sidekick.core import Sidekick, Evaluator, Planner, State, EvaluatorOutput, PlannerOutput
 
-__all__ = ["Sidekick", "Evaluator", "State", "EvaluatorOutput"]
\ No newline at end of file
+__all__ = ["Sidekick", "Evaluator", "Planner", "State", "EvaluatorOutput", "PlannerOutput"]
\ No newline at end of file
@@ -1,5 +1,7 @@
 from sidekick.core.agent import Sidekick
 from sidekick.core.evaluator import Evaluator
-from sidekick.core.state import State, EvaluatorOutput
+from sidekick.core.planner import Planner
+from sidekick.core.supervisor import SessionSupervisor
+from sidekick.core.state import State, EvaluatorOutput, PlannerOutput
 
-__all__ = ["Sidekick", "Evaluator", "State", "EvaluatorOutput"]
+__all__ = ["Sidekick", "Evaluator", "Planner", "SessionSupervisor", "State", "EvaluatorOutput", "PlannerOutput"]
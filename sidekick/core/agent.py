@@ -4,42 +4,69 @@ from langchain_openai import ChatOpenAI
 from sidekick.core.state import State
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 from typing import Dict, Any
+from contextlib import asynccontextmanager
 import asyncio
 from datetime import datetime
+import time
 import uuid
 import logging
-from sidekick.tools import get_all_tools
+from sidekick.tools import get_all_tools, is_parallel_safe_tool
 from sidekick.core.evaluator import Evaluator
-from config.settings import DEFAULT_MODEL, SQLITE_DB_FILE
+from sidekick.core.planner import Planner
+from sidekick.core.supervisor import session_supervisor
+from sidekick.memory.transcript_store import transcript_store, messages_to_turns
+from config.settings import DEFAULT_MODEL, SQLITE_DB_FILE, ENABLE_PLANNER, MAX_PARALLEL_WORKERS
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of LLM calls a single subtask worker may make
+SUBTASK_MAX_STEPS = 10
+
 class Sidekick:
-    def __init__(self):
+    def __init__(self, use_planner=ENABLE_PLANNER, sidekick_id=None):
         self.worker_llm_with_tools = None
+        self.subtask_llm_with_tools = None
         self.tools = None
+        self.subtask_tools = None
         self.graph = None
-        self.sidekick_id = str(uuid.uuid4())
+        # Reusing an id resumes that thread from the checkpointer
+        self.sidekick_id = sidekick_id or str(uuid.uuid4())
         # Will be initialized in setup()
         self.memory = None
         self.browser = None
         self.playwright = None
         self.evaluator = Evaluator()
+        self.planner = Planner() if use_planner else None
+        self.transcripts = transcript_store
+        self.supervisor = session_supervisor
+        # Activity tracking used by the supervisor to reap idle sessions;
+        # active_runs counts graph runs and transcript reads in flight
+        self.last_active = time.monotonic()
+        self.active_runs = 0
+        self.closed = False  # Set when closing starts; no new runs are accepted
+        self._releasing = False  # Set once resources are being released; no new reads either
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._released = asyncio.Event()
 
     async def setup(self):
         self.tools, self.browser, self.playwright = await get_all_tools()
         worker_llm = ChatOpenAI(model=DEFAULT_MODEL)
         self.worker_llm_with_tools = worker_llm.bind_tools(self.tools)
+        # Parallel subtask workers only get tools that are safe to call concurrently
+        self.subtask_tools = [tool for tool in self.tools if is_parallel_safe_tool(tool)]
+        self.subtask_llm_with_tools = worker_llm.bind_tools(self.subtask_tools)
         
         # Initialize the SQLite saver
         conn = await aiosqlite.connect(SQLITE_DB_FILE)
         self.memory = AsyncSqliteSaver(conn)
         
         await self.build_graph()
+        self.supervisor.register(self)
     
     def worker(self, state: State) -> Dict[str, Any]:
         system_message = f"""You are a helpful assistant that can use tools to complete tasks.
@@ -65,6 +92,14 @@ class Sidekick:
     {state["feedback_on_work"]}
     With this feedback, please continue the assignment, ensuring that you meet the success criteria or have a question for the user."""
 
+        if state.get("subtask_results"):
+            findings = "\n\n".join(state["subtask_results"])
+            system_message += f"""
+    This request was split into independent subtasks that have already been worked on in parallel.
+    Here are their results:
+    {findings}
+    Combine these results into your reply, using tools only if something is still missing."""
+
         # Add in the system message
 
         found_system_message = False
@@ -85,6 +120,36 @@ class Sidekick:
             "messages": [response],
         }
 
+    async def subtask_worker(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        subtask = task["subtask"]
+        system_message = f"""You are a helpful assistant working on one part of a larger request.
+    Other assistants are handling the other parts in parallel, so focus only on your subtask.
+    You have tools to search the internet and Wikipedia and to read files in the sandbox. You cannot change files.
+    The current date and time is {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+    The success criteria for the overall request is:
+    {task["success_criteria"]}
+    Reply with a concise, factual result for your subtask."""
+
+        messages = [SystemMessage(content=system_message), HumanMessage(content=subtask)]
+        tool_node = ToolNode(tools=self.subtask_tools)
+
+        # A failing subtask must not fail the whole run; report it to the merging worker instead
+        try:
+            response = None
+            for _ in range(SUBTASK_MAX_STEPS):
+                response = await self.subtask_llm_with_tools.ainvoke(messages)
+                messages.append(response)
+                if not response.tool_calls:
+                    break
+                tool_result = await tool_node.ainvoke({"messages": messages})
+                messages.extend(tool_result["messages"])
+            result = response.content if response is not None and response.content else "No result"
+        except Exception as e:
+            logger.error(f"Subtask failed: {subtask}: {e}")
+            result = f"failed: {e}"
+        return {"subtask_results": [f"Subtask: {subtask}\nResult: {result}"]}
+
     def worker_router(self, state: State) -> str:
         last_message = state["messages"][-1]
 
@@ -104,6 +169,9 @@ class Sidekick:
         graph_builder.add_node("worker", self.worker)
         graph_builder.add_node("tools", ToolNode(tools=self.tools))
         graph_builder.add_node("evaluator", self.evaluator.evaluate)
+        if self.planner:
+            graph_builder.add_node("planner", self.planner.plan)
+            graph_builder.add_node("subtask_worker", self.subtask_worker)
 
         # Add edges
         graph_builder.add_conditional_edges(
@@ -113,15 +181,39 @@ class Sidekick:
         graph_builder.add_conditional_edges(
             "evaluator", self.evaluator.route_based_on_evaluation, {"worker": "worker", "END": END}
         )
-        graph_builder.add_edge(START, "worker")
+        if self.planner:
+            # Subtask workers run in parallel and all finish before the worker merges them
+            graph_builder.add_conditional_edges(
+                "planner", self.planner.route_subtasks, ["worker", "subtask_worker"]
+            )
+            graph_builder.add_edge("subtask_worker", "worker")
+            graph_builder.add_edge(START, "planner")
+        else:
+            graph_builder.add_edge(START, "worker")
 
         # Compile the graph
         self.graph = graph_builder.compile(checkpointer=self.memory)
 
-    async def run_superstep(self, message, success_criteria, history):
+    @asynccontextmanager
+    async def _activity(self, run=True):
+        # Checked before the first await, so a close that has already started is never raced
+        if self.closed if run else self._releasing:
+            raise RuntimeError(f"Session {self.sidekick_id} has been closed")
+        self.active_runs += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self.active_runs -= 1
+            self.last_active = time.monotonic()
+            if not self.active_runs:
+                self._idle.set()
+
+    async def run_superstep(self, message, success_criteria):
         config = {
             "configurable": {"thread_id": self.sidekick_id},
-            "recursion_limit": 50  # Increase recursion limit to avoid errors
+            "recursion_limit": 50,  # Increase recursion limit to avoid errors
+            "max_concurrency": MAX_PARALLEL_WORKERS,  # Cap parallel subtask workers
         }
 
         state = {
@@ -130,22 +222,76 @@ class Sidekick:
             "feedback_on_work": None,
             "success_criteria_met": False,
             "user_input_needed": False,
+            "subtasks": [],
+            "subtask_results": None,  # Clears results from the previous superstep
         }
-        result = await self.graph.ainvoke(state, config=config)
-        user = {"role": "user", "content": message}
-        reply = {"role": "assistant", "content": result["messages"][-2].content}
-        feedback = {"role": "assistant", "content": result["messages"][-1].content}
-        return history + [user, reply, feedback]
+        async with self._activity():
+            try:
+                snapshot = await self.graph.aget_state(config)
+                previous_count = len(snapshot.values.get("messages", []))
+                result = await self.graph.ainvoke(state, config=config)
+            except Exception:
+                # A failed run may still have checkpointed some messages; rebuild on next load
+                self.transcripts.discard(self.sidekick_id)
+                raise
+        # Convert only what this superstep added, the same way a rebuild from the checkpointer does
+        new_turns = messages_to_turns(result["messages"][previous_count:])
+        self.add_turns(new_turns)
+        return new_turns
+
+    async def get_transcript(self):
+        async with self._activity(run=False):
+            return await self.transcripts.load(self.sidekick_id, self.graph)
+
+    async def get_history_page(self, limit, offset=0):
+        async with self._activity(run=False):
+            return await self.transcripts.page(self.sidekick_id, self.graph, limit, offset)
+
+    def add_turns(self, turns):
+        self.transcripts.append(self.sidekick_id, turns)
+
+    async def aclose(self):
+        """
+        Close the browser, Playwright and the SQLite connection; safe to call more than once.
+
+        New runs are refused straight away, but runs and transcript reads already
+        in flight are allowed to finish before anything is released.
+        """
+        if self.closed:
+            await self._released.wait()
+            return
+        self.closed = True
+        # A read can start while the last run is finishing, so wait until nothing is in flight
+        while self.active_runs:
+            await self._idle.wait()
+        self._releasing = True
+        self.supervisor.unregister(self)
+        self.transcripts.discard(self.sidekick_id)
+        try:
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+        except Exception as e:
+            logger.error(f"Failed to close browser for session {self.sidekick_id}: {e}")
+        finally:
+            self.browser = None
+            self.playwright = None
+        try:
+            if self.memory:
+                await self.memory.conn.close()
+        except Exception as e:
+            logger.error(f"Failed to close database for session {self.sidekick_id}: {e}")
+        finally:
+            self.memory = None
+            self._released.set()
 
     def cleanup(self):
-        if self.browser:
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(self.browser.close())
-                if self.playwright:
-                    loop.create_task(self.playwright.stop())
-            except RuntimeError:
-                # If no loop is running, do a direct run
-                asyncio.run(self.browser.close())
-                if self.playwright:
-                    asyncio.run(self.playwright.stop())
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # If no loop is running, do a direct run
+            asyncio.run(self.aclose())
+        else:
+            # Track the shutdown so it is awaited rather than left dangling
+            self.supervisor.track(loop.create_task(self.aclose()))
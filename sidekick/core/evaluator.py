@@ -3,6 +3,7 @@ from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from typing import List, Any, Dict
 import logging
 from sidekick.core.state import EvaluatorOutput, State
+from sidekick.memory.transcript_store import EVALUATOR_FEEDBACK_PREFIX
 from config.settings import DEFAULT_MODEL
 
 # Set up logging
@@ -88,7 +89,7 @@ class Evaluator:
             "messages": [
                 {
                     "role": "assistant",
-                    "content": f"Evaluator Feedback on this answer: {eval_result.feedback}",
+                    "content": f"{EVALUATOR_FEEDBACK_PREFIX}{eval_result.feedback}",
                 }
             ],
             "feedback_on_work": eval_result.feedback,
@@ -0,0 +1,80 @@
+from langchain_openai import ChatOpenAI
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.types import Send
+from typing import Any, Dict, List, Union
+import logging
+from sidekick.core.state import PlannerOutput, State
+from config.settings import DEFAULT_MODEL, MAX_SUBTASKS
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class Planner:
+    """
+    Planner class that splits a request into independent subtasks.
+
+    When a request has several parts that do not depend on each other (for
+    example, researching five products to compare them), each part is sent to
+    its own subtask worker so they run in parallel. Requests that cannot be
+    split go straight to the regular worker.
+    """
+
+    def __init__(self, max_subtasks: int = MAX_SUBTASKS):
+        """Initialize the Planner with the appropriate LLM."""
+        planner_llm = ChatOpenAI(model=DEFAULT_MODEL)
+        self.planner_llm_with_output = planner_llm.with_structured_output(PlannerOutput)
+        self.max_subtasks = max_subtasks
+
+    def plan(self, state: State) -> Dict[str, Any]:
+        """
+        Break the latest user request into independent subtasks.
+
+        Args:
+            state: The current state containing messages and success criteria.
+
+        Returns:
+            Dict[str, Any]: State update with the planned subtasks.
+        """
+        request = state["messages"][-1].content
+
+        system_message = f"""You are a planner that decides whether a request can be split into independent subtasks.
+    Only split the request if it contains parts that can each be researched or solved on their own, without needing the result of another part.
+    For example, "compare these five products" can be split into one subtask per product.
+    Each subtask must be self-contained, because it will be worked on separately without seeing the original request.
+    Return at most {self.max_subtasks} subtasks. If the request is a single task, or its parts depend on each other, return an empty list."""
+
+        user_message = f"""The request is:
+    {request}
+
+    The success criteria for this request is:
+    {state["success_criteria"]}
+    """
+
+        planner_messages = [
+            SystemMessage(content=system_message),
+            HumanMessage(content=user_message),
+        ]
+
+        plan_result = self.planner_llm_with_output.invoke(planner_messages)
+        subtasks = [task for task in plan_result.subtasks if task.strip()][: self.max_subtasks]
+        return {"subtasks": subtasks}
+
+    def route_subtasks(self, state: State) -> Union[str, List[Send]]:
+        """
+        Fan out to one subtask worker per subtask, or fall back to the regular worker.
+
+        Args:
+            state: The current state after planning.
+
+        Returns:
+            Union[str, List[Send]]: "worker", or a Send to "subtask_worker" for each subtask.
+        """
+        subtasks = state.get("subtasks") or []
+        if len(subtasks) < 2:
+            logger.info("No independent subtasks, routing to worker")
+            return "worker"
+        logger.info(f"Fanning out {len(subtasks)} subtasks to parallel workers")
+        return [
+            Send("subtask_worker", {"subtask": subtask, "success_criteria": state["success_criteria"]})
+            for subtask in subtasks
+        ]
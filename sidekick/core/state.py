@@ -3,16 +3,30 @@ from typing_extensions import TypedDict
 from langgraph.graph.message import add_messages
 from pydantic import BaseModel, Field
 
+def merge_subtask_results(left: Optional[List[str]], right: Optional[List[str]]) -> List[str]:
+    """Concatenate results from parallel subtask workers; a None update clears them."""
+    if right is None:
+        return []
+    return (left or []) + right
+
 class State(TypedDict):
     messages: Annotated[List[Any], add_messages]
     success_criteria: str
     feedback_on_work: Optional[str]
     success_criteria_met: bool
     user_input_needed: bool
+    subtasks: List[str]
+    subtask_results: Annotated[List[str], merge_subtask_results]
 
 class EvaluatorOutput(BaseModel):
     feedback: str = Field(description="Feedback on the assistant's response")
     success_criteria_met: bool = Field(description="Whether the success criteria have been met")
     user_input_needed: bool = Field(
         description="True if more input is needed from the user, or clarifications, or the assistant is stuck"
-    )
\ No newline at end of file
+    )
+
+class PlannerOutput(BaseModel):
+    subtasks: List[str] = Field(
+        description="Independent, self-contained subtasks that can be worked on in parallel, "
+        "or an empty list if the request should be handled as a single task"
+    )
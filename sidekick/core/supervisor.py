@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set
+import psutil
+from config.settings import SESSION_IDLE_TTL, RSS_WATERMARK_MB, RSS_LOW_WATERMARK_MB, REAPER_INTERVAL
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class SessionSupervisor:
+    """
+    Supervisor that tracks every live Sidekick and frees the resources of stale ones.
+
+    Each Sidekick owns a Chromium browser, a Playwright driver and an aiosqlite
+    connection. Sessions are registered when they are set up; a background task
+    periodically closes sessions idle for longer than the TTL and, when the
+    resident memory of the browser processes crosses the watermark, evicts the
+    least recently used sessions until it is back under the low watermark.
+    Sessions in the middle of a run are never reaped.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        rss_watermark_mb: float = RSS_WATERMARK_MB,
+        rss_low_watermark_mb: float = RSS_LOW_WATERMARK_MB,
+        interval: float = REAPER_INTERVAL,
+    ):
+        self.idle_ttl = idle_ttl
+        self.rss_watermark_mb = rss_watermark_mb
+        self.rss_low_watermark_mb = rss_low_watermark_mb
+        self.interval = interval
+        self._sessions: Dict[str, Any] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._reaper: Optional[asyncio.Task] = None
+
+    def register(self, sidekick) -> None:
+        """Start tracking a Sidekick and make sure the reaper is running."""
+        self._sessions[sidekick.sidekick_id] = sidekick
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_forever())
+
+    def unregister(self, sidekick) -> None:
+        """Stop tracking a Sidekick, if it is still the one registered under its id."""
+        if self._sessions.get(sidekick.sidekick_id) is sidekick:
+            del self._sessions[sidekick.sidekick_id]
+
+    def track(self, task: asyncio.Task) -> asyncio.Task:
+        """Keep a reference to a shutdown task so it is not garbage collected mid-flight."""
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
+
+    def _is_idle(self, sidekick, now: float) -> bool:
+        return (
+            not sidekick.closed
+            and not sidekick.active_runs
+            and now - sidekick.last_active > self.idle_ttl
+        )
+
+    def _eviction_candidates(self) -> List[Any]:
+        """Sessions that are not running, least recently used first."""
+        idle = [
+            sidekick
+            for sidekick in self._sessions.values()
+            if not sidekick.closed and not sidekick.active_runs
+        ]
+        return sorted(idle, key=lambda sidekick: sidekick.last_active)
+
+    async def reap_idle(self) -> int:
+        """
+        Close every session that has been idle for longer than the TTL.
+
+        Returns:
+            int: The number of sessions closed.
+        """
+        reaped = 0
+        for sidekick in list(self._sessions.values()):
+            # Checked right before each close: a session may have started a run while
+            # an earlier one was closing. aclose() marks the session closed before its
+            # first await and waits for anything still in flight, and run_superstep
+            # refuses closed sessions, so a close never cuts a run short.
+            if not self._is_idle(sidekick, time.monotonic()):
+                continue
+            logger.info(f"Reaping idle session {sidekick.sidekick_id}")
+            await sidekick.aclose()
+            reaped += 1
+        return reaped
+
+    async def enforce_watermark(self) -> int:
+        """
+        Evict least recently used sessions when browser memory crosses the watermark.
+
+        Only the child processes (Playwright and Chromium) are measured, since
+        that is the memory closing a session gives back. Eviction continues
+        until memory is under the low watermark, and stops early if closing a
+        session no longer lowers it, so memory that sessions do not account for
+        costs at most one eviction per pass.
+
+        Returns:
+            int: The number of sessions evicted.
+        """
+        rss_mb = await asyncio.to_thread(browser_memory_mb)
+        if rss_mb <= self.rss_watermark_mb:
+            return 0
+
+        evicted = 0
+        while rss_mb > self.rss_low_watermark_mb:
+            candidates = self._eviction_candidates()
+            if not candidates:
+                logger.warning(
+                    f"Browser RSS {rss_mb:.0f} MB is above the watermark but every session is busy"
+                )
+                break
+            sidekick = candidates[0]
+            logger.info(f"Browser RSS {rss_mb:.0f} MB, evicting least recently used session {sidekick.sidekick_id}")
+            await sidekick.aclose()
+            evicted += 1
+            previous_mb, rss_mb = rss_mb, await asyncio.to_thread(browser_memory_mb)
+            if rss_mb >= previous_mb:
+                logger.warning("Browser RSS did not drop after evicting a session, stopping eviction")
+                break
+        return evicted
+
+    async def _reap_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reap_idle()
+                await self.enforce_watermark()
+            except Exception as e:
+                logger.error(f"Session reaper failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report live session and resource counts.
+
+        Returns:
+            Dict[str, Any]: Session, browser, connection and process counts, and resident memory in MB.
+        """
+        sessions = list(self._sessions.values())
+        return {
+            "sessions": len(sessions),
+            "active_runs": sum(sidekick.active_runs for sidekick in sessions),
+            "browsers": sum(1 for sidekick in sessions if sidekick.browser is not None),
+            "db_connections": sum(1 for sidekick in sessions if sidekick.memory is not None),
+            "pending_shutdowns": len(self._pending),
+            "child_processes": len(psutil.Process().children(recursive=True)),
+            "browser_rss_mb": round(browser_memory_mb(), 1),
+            "rss_mb": round(resident_memory_mb(), 1),
+        }
+
+
+def browser_memory_mb() -> float:
+    """Resident memory of this process's children (Playwright, Chromium), in MB."""
+    rss = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            rss += child.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return rss / (1024 * 1024)
+
+
+def resident_memory_mb() -> float:
+    """Resident memory of this process and its children, in MB."""
+    return psutil.Process().memory_info().rss / (1024 * 1024) + browser_memory_mb()
+
+
+# Shared by every session in the process
+session_supervisor = SessionSupervisor()
@@ -0,0 +1,124 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+from langchain_core.messages import AIMessage, HumanMessage
+from config.settings import TRANSCRIPT_CACHE_THREADS
+
+# Prefix the evaluator puts on its feedback messages
+EVALUATOR_FEEDBACK_PREFIX = "Evaluator Feedback on this answer: "
+
+
+def messages_to_turns(messages: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Convert checkpointed graph messages into chat turns for the UI.
+
+    Each user message is followed by the final reply and the final evaluator
+    feedback of its superstep. Drafts the evaluator rejected, tool calls, tool
+    results and system prompts are internal to the graph and are left out.
+    Run on a whole thread or on the messages of one superstep, it yields the
+    same turns, so cached and rebuilt transcripts always match.
+
+    Args:
+        messages: Message objects from a checkpointed graph state.
+
+    Returns:
+        List[Dict[str, Any]]: Turns in the {"role", "content"} format used by the chatbot.
+    """
+    turns = []
+    reply = feedback = None
+
+    def close_exchange():
+        for content in (reply, feedback):
+            if content is not None:
+                turns.append({"role": "assistant", "content": content})
+
+    for message in messages:
+        if isinstance(message, HumanMessage):
+            close_exchange()
+            reply = feedback = None
+            turns.append({"role": "user", "content": message.content})
+        elif isinstance(message, AIMessage) and message.content and not message.tool_calls:
+            if message.content.startswith(EVALUATOR_FEEDBACK_PREFIX):
+                feedback = message.content
+            else:
+                reply = message.content
+    close_exchange()
+    return turns
+
+
+class TranscriptStore:
+    """
+    Server-side chat transcript per thread_id.
+
+    The SQLite checkpointer is the canonical record of every conversation; this
+    store keeps a compact list of chat turns for recently active threads so the
+    UI never has to round-trip the full history through the browser. Threads
+    evicted from the cache are rebuilt from the checkpointer on next access.
+    """
+
+    def __init__(self, max_threads: int = TRANSCRIPT_CACHE_THREADS):
+        self.max_threads = max_threads
+        self._cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+
+    async def load(self, thread_id: str, graph) -> List[Dict[str, Any]]:
+        """
+        Return the full transcript for a thread, reading the checkpointer on a cache miss.
+
+        Args:
+            thread_id: The conversation thread identifier.
+            graph: The compiled graph whose checkpointer holds the thread.
+
+        Returns:
+            List[Dict[str, Any]]: The thread's chat turns, oldest first.
+        """
+        turns = self._cache.get(thread_id)
+        if turns is not None:
+            self._cache.move_to_end(thread_id)
+            return turns
+
+        snapshot = await graph.aget_state({"configurable": {"thread_id": thread_id}})
+        turns = messages_to_turns(snapshot.values.get("messages", []))
+
+        # Another task may have populated the thread while we were reading
+        turns = self._cache.setdefault(thread_id, turns)
+        self._cache.move_to_end(thread_id)
+        while len(self._cache) > self.max_threads:
+            self._cache.popitem(last=False)
+        return turns
+
+    def append(self, thread_id: str, turns: List[Dict[str, Any]]) -> None:
+        """
+        Append new turns to a cached thread.
+
+        If the thread is not cached this is a no-op: the checkpointer already
+        holds the graph's messages and the next load() rebuilds from it.
+        """
+        cached = self._cache.get(thread_id)
+        if cached is not None:
+            cached.extend(turns)
+
+    async def page(
+        self, thread_id: str, graph, limit: int, offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Return a window of turns counted back from the most recent one.
+
+        Args:
+            thread_id: The conversation thread identifier.
+            graph: The compiled graph whose checkpointer holds the thread.
+            limit: Maximum number of turns to return.
+            offset: Number of most recent turns to skip.
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: The turns, oldest first, and the total turn count.
+        """
+        turns = await self.load(thread_id, graph)
+        end = max(len(turns) - offset, 0)
+        return turns[max(end - limit, 0):end], len(turns)
+
+    def discard(self, thread_id: str) -> None:
+        """Drop a thread from the cache; its checkpoints are left untouched."""
+        self._cache.pop(thread_id, None)
+
+
+# Shared across sessions so the cache bound applies to the whole process
+transcript_store = TranscriptStore()
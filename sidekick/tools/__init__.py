@@ -1,23 +1,45 @@
-from sidekick.tools.browser import playwright_tools
-from sidekick.tools.file_tools import get_file_tools
+from sidekick.tools.browser import playwright_tools, is_browser_tool
+from sidekick.tools.file_tools import get_file_tools, is_mutating_file_tool
+from sidekick.tools.ranged_file_tools import get_ranged_file_tools
 from sidekick.tools.notifications import get_notification_tool
 from sidekick.tools.search_tools import get_search_tools
-from sidekick.tools.python_tools import get_python_repl_tool
+from sidekick.tools.python_tools import get_python_repl_tool, is_python_repl_tool
 from sidekick.tools.output_tools import get_output_saver_tool
 
+# Tools that act on the user's behalf; only the main worker may use them
+USER_FACING_TOOL_NAMES = {"send_push_notification", "save_conversation_output"}
+
+def is_parallel_safe_tool(tool):
+    """
+    Check whether a tool can be used by subtask workers running in parallel.
+
+    Browser tools share a single page, the Python REPL shares sys.stdout and
+    the write, copy, move and delete file tools share the sandbox, so none of
+    them is safe to call concurrently. Notification and output-saving tools
+    are also excluded, because they belong to the worker that merges the
+    subtask results. Read-only file tools remain available.
+    """
+    return not (
+        is_browser_tool(tool)
+        or is_python_repl_tool(tool)
+        or is_mutating_file_tool(tool)
+        or getattr(tool, "name", "") in USER_FACING_TOOL_NAMES
+    )
+
 async def get_all_tools():
     """
     Get all tools available in the sidekick system.
     
     Returns:
-        list: A list of all tools, including browser tools, file tools, 
-        notification tools, search tools, and Python REPL.
+        list: A list of all tools, including browser tools, file tools, ranged
+        file tools for large files, notification tools, search tools, and Python REPL.
     """
     # Get browser tools first (they require async initialization)
     browser_tools, browser, playwright = await playwright_tools()
     
     # Get all other tools
     file_tools = get_file_tools()
+    ranged_file_tools = get_ranged_file_tools()
     notification_tool = get_notification_tool()
     search_tools = get_search_tools()
     python_repl = get_python_repl_tool()
@@ -26,6 +48,7 @@ async def get_all_tools():
     all_tools = (
         browser_tools
         + file_tools
+        + ranged_file_tools
         + [notification_tool]
         + search_tools
         + [python_repl]
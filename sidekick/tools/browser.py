@@ -1,4 +1,5 @@
 from langchain_community.agent_toolkits import PlayWrightBrowserToolkit
+from langchain_community.tools.playwright.base import BaseBrowserTool
 from playwright.async_api import async_playwright
 import os
 import logging
@@ -38,4 +39,14 @@ async def playwright_tools():
     except Exception as e:
         logger.error(f"Failed to initialize Playwright tools: {e}")
         # Return empty tools list if browser initialization fails
-        return [], None, None
\ No newline at end of file
+        return [], None, None
+
+
+def is_browser_tool(tool):
+    """
+    Check whether a tool drives the shared Playwright browser.
+
+    All browser tools act on the same current page, so they must not be used
+    from parallel branches of the graph.
+    """
+    return isinstance(tool, BaseBrowserTool)
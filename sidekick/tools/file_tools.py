@@ -1,6 +1,17 @@
 from langchain_community.agent_toolkits import FileManagementToolkit
 
+# Root directory shared by every agent-facing file tool
+SANDBOX_DIR = "sandbox"
+
+# FileManagementToolkit tools that change the contents of the sandbox
+MUTATING_FILE_TOOL_NAMES = {"write_file", "copy_file", "move_file", "file_delete"}
+
 
 def get_file_tools():
-    toolkit = FileManagementToolkit(root_dir="sandbox")
-    return toolkit.get_tools()
\ No newline at end of file
+    toolkit = FileManagementToolkit(root_dir=SANDBOX_DIR)
+    return toolkit.get_tools()
+
+
+def is_mutating_file_tool(tool):
+    """Check whether a tool writes, copies, moves or deletes files in the shared sandbox."""
+    return getattr(tool, "name", "") in MUTATING_FILE_TOOL_NAMES
@@ -3,3 +3,12 @@ from langchain_experimental.tools import PythonREPLTool
 def get_python_repl_tool():
     """Get a tool for executing Python code in a REPL environment"""
     return PythonREPLTool()
+
+def is_python_repl_tool(tool):
+    """
+    Check whether a tool is the Python REPL.
+
+    The REPL swaps the global sys.stdout while it runs, so concurrent calls
+    from parallel branches of the graph would mix up each other's output.
+    """
+    return isinstance(tool, PythonREPLTool)
@@ -0,0 +1,324 @@
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Tuple
+
+from langchain_core.tools import StructuredTool
+from langchain_community.tools.file_management.utils import (
+    INVALID_PATH_TEMPLATE,
+    FileValidationError,
+    get_validated_relative_path,
+)
+from sidekick.tools.file_tools import SANDBOX_DIR
+
+# Upper bounds that keep a single tool result small enough for the conversation
+MAX_LINES_PER_CALL = 500
+MAX_BYTES_PER_CALL = 64 * 1024
+MAX_SEARCH_MATCHES = 200
+MAX_LINE_CHARS = 2000
+
+# Bytes of whole lines decoded at a time by search_file
+SEARCH_CHUNK_BYTES = 1024 * 1024
+
+# Number of files whose line-offset index is kept in memory
+LINE_INDEX_CACHE_SIZE = 16
+
+_line_index_cache: "OrderedDict[str, Tuple[int, int, array]]" = OrderedDict()
+_line_index_lock = threading.Lock()
+
+
+class FileToolError(Exception):
+    """Raised for user-facing errors in the ranged file tools."""
+
+
+def _resolve(file_path: str) -> Path:
+    """
+    Resolve a sandbox-relative path using the same rules as FileManagementToolkit.
+
+    Raises:
+        FileToolError: If the path escapes the sandbox or is not a regular file.
+    """
+    try:
+        path = get_validated_relative_path(Path(SANDBOX_DIR), file_path)
+    except FileValidationError:
+        raise FileToolError(INVALID_PATH_TEMPLATE.format(arg_name="file_path", value=file_path))
+    if not path.is_file():
+        raise FileToolError(f"Error: no such file: {file_path}")
+    return path
+
+
+@contextmanager
+def _mapped(path: Path):
+    """
+    Memory-map a file read-only.
+
+    Yields the mapping together with the ``os.stat_result`` of the same open
+    handle, so cache keys always describe the contents that were mapped.
+    Empty files, which mmap cannot map, yield b"".
+    """
+    with path.open("rb") as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            yield b"", stat
+            return
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mm, stat
+        finally:
+            mm.close()
+
+
+def _build_line_index(mm) -> array:
+    """
+    Build the byte offsets of every line start, followed by the file size.
+
+    Line ``n`` (zero-based) spans ``offsets[n]:offsets[n + 1]``, so the
+    number of lines is ``len(offsets) - 1``.
+    """
+    offsets = array("Q", [0])
+    pos = mm.find(b"\n")
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = mm.find(b"\n", pos + 1)
+    if offsets[-1] != len(mm):
+        offsets.append(len(mm))
+    return offsets
+
+
+def _line_index(path: Path, mm, stat: os.stat_result) -> array:
+    """Return the cached line index for a file, rebuilding it if the file changed."""
+    key = str(path)
+    with _line_index_lock:
+        cached = _line_index_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            _line_index_cache.move_to_end(key)
+            return cached[2]
+
+    offsets = _build_line_index(mm)
+
+    with _line_index_lock:
+        _line_index_cache[key] = (stat.st_mtime_ns, stat.st_size, offsets)
+        _line_index_cache.move_to_end(key)
+        while len(_line_index_cache) > LINE_INDEX_CACHE_SIZE:
+            _line_index_cache.popitem(last=False)
+    return offsets
+
+
+def _read_line(mm, offsets: array, n: int) -> str:
+    """
+    Decode zero-based line ``n``, truncated to MAX_LINE_CHARS.
+
+    Only the first MAX_LINE_CHARS * 4 bytes (the longest UTF-8 encoding of that
+    many characters) are copied, so a huge single-line file is never read whole.
+    """
+    start, end = offsets[n], offsets[n + 1]
+    limit = min(end, start + MAX_LINE_CHARS * 4)
+    text = mm[start:limit].rstrip(b"\r\n").decode("utf-8", errors="replace")
+    if limit < end or len(text) > MAX_LINE_CHARS:
+        text = text[:MAX_LINE_CHARS] + " …[line truncated]"
+    return text
+
+
+def _format_lines(mm, offsets: array, start: int, end: int) -> str:
+    """
+    Format zero-based lines ``start``..``end`` (exclusive) with 1-based line numbers.
+
+    Output stops early once it would exceed MAX_BYTES_PER_CALL UTF-8 bytes.
+    """
+    out: List[str] = []
+    used = 0
+    for n in range(start, end):
+        entry = f"{n + 1}: {_read_line(mm, offsets, n)}"
+        used += len(entry.encode("utf-8")) + 1
+        if out and used > MAX_BYTES_PER_CALL:
+            out.append(f"…[output truncated at line {n + 1}; request a smaller range]")
+            break
+        out.append(entry)
+    return "\n".join(out)
+
+
+def read_file_lines(file_path: str, start_line: int = 1, num_lines: int = 100) -> str:
+    """Read ``num_lines`` lines starting at 1-based ``start_line``."""
+    try:
+        path = _resolve(file_path)
+        num_lines = max(1, min(num_lines, MAX_LINES_PER_CALL))
+        with _mapped(path) as (mm, stat):
+            offsets = _line_index(path, mm, stat)
+            total = len(offsets) - 1
+            start = max(start_line, 1) - 1
+            if start >= total:
+                return f"Error: start_line {start_line} is past the end of the file ({total} lines)"
+            return _format_lines(mm, offsets, start, min(start + num_lines, total))
+    except FileToolError as e:
+        return str(e)
+    except Exception as e:
+        return "Error: " + str(e)
+
+
+def read_file_bytes(file_path: str, offset: int = 0, length: int = 4096) -> str:
+    """Read ``length`` bytes starting at byte ``offset``, decoded as UTF-8."""
+    try:
+        path = _resolve(file_path)
+        length = max(0, min(length, MAX_BYTES_PER_CALL))
+        with _mapped(path) as (mm, _):
+            size = len(mm)
+            if offset < 0:
+                offset = max(size + offset, 0)
+            if offset >= size:
+                return f"Error: offset {offset} is past the end of the file ({size} bytes)"
+            return mm[offset:offset + length].decode("utf-8", errors="replace")
+    except FileToolError as e:
+        return str(e)
+    except Exception as e:
+        return "Error: " + str(e)
+
+
+def search_file(
+    file_path: str,
+    pattern: str,
+    max_matches: int = 50,
+    ignore_case: bool = False,
+) -> str:
+    """
+    Return the lines matching a regular expression, stopping after ``max_matches``.
+
+    The file is decoded as UTF-8 in chunks of whole lines (about
+    SEARCH_CHUNK_BYTES each, or a single line if it is longer), so the pattern
+    has normal ``str`` semantics: ``.``, ``\\w`` and case folding work on
+    characters, not bytes. Matches cannot span chunk boundaries, which only
+    matters for patterns that match across newlines.
+    """
+    try:
+        path = _resolve(file_path)
+        max_matches = max(1, min(max_matches, MAX_SEARCH_MATCHES))
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        try:
+            regex = re.compile(pattern, flags)
+        except re.error as e:
+            return f"Error: invalid pattern: {e}"
+
+        with _mapped(path) as (mm, stat):
+            offsets = _line_index(path, mm, stat)
+            total = len(offsets) - 1
+            matches: List[str] = []
+            first = 0
+            while first < total and len(matches) < max_matches:
+                last = max(bisect_right(offsets, offsets[first] + SEARCH_CHUNK_BYTES) - 1, first + 1)
+                text = mm[offsets[first]:offsets[last]].decode("utf-8", errors="replace")
+                line, counted, pos = first, 0, 0
+                while True:
+                    match = regex.search(text, pos)
+                    if match is None:
+                        break
+                    line += text.count("\n", counted, match.start())
+                    counted = match.start()
+                    if line >= last:
+                        break
+                    matches.append(f"{line + 1}: {_read_line(mm, offsets, line)}")
+                    if len(matches) >= max_matches:
+                        matches.append(f"…[match limit of {max_matches} reached]")
+                        break
+                    # Resume at the next line so repeated matches on one line are not scanned
+                    newline = text.find("\n", match.start())
+                    if newline == -1:
+                        break
+                    pos = counted = newline + 1
+                    line += 1
+                first = last
+        return "\n".join(matches) if matches else "No matches found"
+    except FileToolError as e:
+        return str(e)
+    except Exception as e:
+        return "Error: " + str(e)
+
+
+def count_file_lines(file_path: str) -> str:
+    """Return the number of lines and bytes in a file."""
+    try:
+        path = _resolve(file_path)
+        with _mapped(path) as (mm, stat):
+            offsets = _line_index(path, mm, stat)
+            return f"{len(offsets) - 1} lines, {len(mm)} bytes"
+    except FileToolError as e:
+        return str(e)
+    except Exception as e:
+        return "Error: " + str(e)
+
+
+def head_file(file_path: str, num_lines: int = 20) -> str:
+    """Return the first ``num_lines`` lines of a file."""
+    return read_file_lines(file_path, start_line=1, num_lines=num_lines)
+
+
+def tail_file(file_path: str, num_lines: int = 20) -> str:
+    """Return the last ``num_lines`` lines of a file."""
+    try:
+        path = _resolve(file_path)
+        num_lines = max(1, min(num_lines, MAX_LINES_PER_CALL))
+        with _mapped(path) as (mm, stat):
+            offsets = _line_index(path, mm, stat)
+            total = len(offsets) - 1
+            return _format_lines(mm, offsets, max(total - num_lines, 0), total)
+    except FileToolError as e:
+        return str(e)
+    except Exception as e:
+        return "Error: " + str(e)
+
+
+def get_ranged_file_tools() -> List[StructuredTool]:
+    """
+    Get tools for reading and searching large sandbox files without loading them whole.
+
+    Files are memory-mapped and a per-file line-offset index is cached, so
+    repeated ranged reads of the same file do not rescan it. Paths are resolved
+    against the same sandbox root as FileManagementToolkit.
+    """
+    return [
+        StructuredTool.from_function(
+            func=read_file_lines,
+            name="read_file_lines",
+            description=(
+                "Read a range of lines from a sandbox file. Use this instead of read_file for "
+                "large files. Lines are numbered from 1; at most "
+                f"{MAX_LINES_PER_CALL} lines are returned per call."
+            ),
+        ),
+        StructuredTool.from_function(
+            func=read_file_bytes,
+            name="read_file_bytes",
+            description=(
+                "Read a byte range from a sandbox file. A negative offset counts from the end "
+                f"of the file; at most {MAX_BYTES_PER_CALL} bytes are returned per call."
+            ),
+        ),
+        StructuredTool.from_function(
+            func=search_file,
+            name="search_file",
+            description=(
+                "Search a sandbox file with a Python regular expression, like grep. The file is "
+                "read as UTF-8 text and matches are reported per line. Returns matching lines "
+                "prefixed with their line numbers, up to max_matches."
+            ),
+        ),
+        StructuredTool.from_function(
+            func=count_file_lines,
+            name="count_file_lines",
+            description="Count the lines and bytes in a sandbox file.",
+        ),
+        StructuredTool.from_function(
+            func=head_file,
+            name="head_file",
+            description="Return the first lines of a sandbox file, like head.",
+        ),
+        StructuredTool.from_function(
+            func=tail_file,
+            name="tail_file",
+            description="Return the last lines of a sandbox file, like tail.",
+        ),
+    ]
@@ -1,7 +1,9 @@
 import gradio as gr
 import os
 from sidekick import Sidekick
+from sidekick.core.supervisor import session_supervisor
 from sidekick.utils.output_saver import save_conversation_to_markdown
+from config.settings import HISTORY_PAGE_SIZE
 
 
 async def setup():
@@ -10,34 +12,54 @@ async def setup():
     return sidekick
 
 
-async def process_message(sidekick, message, success_criteria, history):
-    # Initialize sidekick if it's None
-    if sidekick is None:
-        sidekick = Sidekick()
+async def ensure_sidekick(sidekick):
+    # Initialize sidekick if it's None; if the supervisor reaped it, resume its thread
+    if sidekick is None or sidekick.closed:
+        sidekick = Sidekick(sidekick_id=sidekick.sidekick_id if sidekick else None)
         await sidekick.setup()
+    return sidekick
+
+
+async def process_message(sidekick, message, success_criteria):
+    sidekick = await ensure_sidekick(sidekick)
     
-    results = await sidekick.run_superstep(message, success_criteria, history)
+    # The transcript lives server-side, so the browser never uploads the history
+    await sidekick.run_superstep(message, success_criteria)
+    transcript = await sidekick.get_transcript()
     
     # Save the conversation to a markdown file
     output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "outputs")
-    saved_file = save_conversation_to_markdown(message, success_criteria, results, output_dir)
+    saved_file = save_conversation_to_markdown(message, success_criteria, transcript, output_dir)
     
-    # Add a notification about the saved file
+    # Notify about the saved file; this is not part of the transcript
     if saved_file:
-        # Create a notification message
-        notification = {
-            "role": "system", 
-            "content": f"📝 Conversation saved to: {os.path.basename(saved_file)}"
-        }
-        results.append(notification)
+        gr.Info(f"📝 Conversation saved to: {os.path.basename(saved_file)}")
     
-    return results, sidekick
+    # Only the most recent page of turns is sent back, and the window shrinks back to it
+    turns, total = await sidekick.get_history_page(HISTORY_PAGE_SIZE)
+    return turns, HISTORY_PAGE_SIZE, gr.update(visible=total > len(turns)), sidekick
+
+
+async def load_earlier(sidekick, history_window):
+    if sidekick is None:
+        return [], history_window, gr.update(visible=False), sidekick
+    sidekick = await ensure_sidekick(sidekick)
+    history_window += HISTORY_PAGE_SIZE
+    turns, total = await sidekick.get_history_page(history_window)
+    return turns, history_window, gr.update(visible=total > len(turns)), sidekick
 
 
-async def reset():
+async def reset(sidekick):
+    # Release the old session's browser and database connection before replacing it
+    if sidekick:
+        await sidekick.aclose()
     new_sidekick = Sidekick()
     await new_sidekick.setup()
-    return "", "", None, new_sidekick
+    return "", "", None, HISTORY_PAGE_SIZE, gr.update(visible=False), new_sidekick
+
+
+def resource_stats():
+    return session_supervisor.stats()
 
 
 def free_resources(sidekick):
@@ -52,7 +74,10 @@ def free_resources(sidekick):
 with gr.Blocks(title="Sidekick", theme=gr.themes.Default(primary_hue="emerald")) as ui:
     gr.Markdown("## Sidekick Personal Co-Worker")
     sidekick = gr.State(delete_callback=free_resources)
+    history_window = gr.State(HISTORY_PAGE_SIZE)
 
+    with gr.Row():
+        load_earlier_button = gr.Button("Load earlier messages", size="sm", visible=False)
     with gr.Row():
         chatbot = gr.Chatbot(label="Sidekick", height=300, type="messages")
     with gr.Group():
@@ -65,16 +90,33 @@ with gr.Blocks(title="Sidekick", theme=gr.themes.Default(primary_hue="emerald"))
     with gr.Row():
         reset_button = gr.Button("Reset", variant="stop")
         go_button = gr.Button("Go!", variant="primary")
+    with gr.Accordion("Resources", open=False):
+        resources = gr.JSON(label="Live sessions and resources")
+        refresh_resources_button = gr.Button("Refresh", size="sm")
 
     # Make sure to initialize the sidekick when the UI loads
     ui.load(setup, [], [sidekick])
     message.submit(
-        process_message, [sidekick, message, success_criteria, chatbot], [chatbot, sidekick]
+        process_message,
+        [sidekick, message, success_criteria],
+        [chatbot, history_window, load_earlier_button, sidekick],
     )
     success_criteria.submit(
-        process_message, [sidekick, message, success_criteria, chatbot], [chatbot, sidekick]
+        process_message,
+        [sidekick, message, success_criteria],
+        [chatbot, history_window, load_earlier_button, sidekick],
     )
     go_button.click(
-        process_message, [sidekick, message, success_criteria, chatbot], [chatbot, sidekick]
+        process_message,
+        [sidekick, message, success_criteria],
+        [chatbot, history_window, load_earlier_button, sidekick],
+    )
+    load_earlier_button.click(
+        load_earlier,
+        [sidekick, history_window],
+        [chatbot, history_window, load_earlier_button, sidekick],
+    )
+    reset_button.click(
+        reset, [sidekick], [message, success_criteria, chatbot, history_window, load_earlier_button, sidekick]
     )
-    reset_button.click(reset, [], [message, success_criteria, chatbot, sidekick])
+    refresh_resources_button.click(resource_stats, [], [resources])